@@ -2,32 +2,101 @@
 #!/usr/bin/env python3
 """
 ffplay music player – Play shuffled music from a folder.
-Creates a temporary MD5‑named copy of each file before playing.
-Uses ffplay in headless mode; playback stops when the process finishes.
+Creates a temporary hash‑named copy of a file when one is needed.
+Prefers one long‑lived mpv process (fed over its JSON IPC socket) so
+codecs are initialized once per session; falls back to spawning ffplay
+per track when mpv is not installed.
 """
 
 import os
+import re
 import sys
+import json
+import time
 import random
 import atexit
+import signal
+import socket
 import hashlib
 import tempfile
 import shutil
+import mmap
 import subprocess
 import platform
+import threading
+import queue
 
 # ------------------------------------------------------------
 # Supported audio file extensions (add more if needed)
 MUSIC_EXTS = {'.mp3', '.flac', '.wav', '.m4a', '.ogg', '.aac',
               '.opus', '.wma', '.ape', '.aiff', '.dsf'}
 
+# Worker threads for the library walk; enough to overlap slow-storage
+# directory reads without thrashing
+_WALK_THREADS = 4
+
+# Extension filter for the walk hot path, compiled once into re's
+# C-level matching engine: a single bound-method call per name replaces
+# the split/lowercase/set-probe chain
+_EXT_SEARCH = re.compile(
+    '(?:' + '|'.join(re.escape(e) for e in sorted(MUSIC_EXTS)) + r')\Z',
+    re.IGNORECASE
+).search
+
+# Constant ffplay argv prefix, built once; play_file only appends the
+# file path
+_FFPLAY_CMD = ('ffplay',
+               '-nodisp',          # no video output
+               '-autoexit',        # exit when playback ends
+               '-loglevel', 'quiet',   # suppress log messages
+               '-hide_banner',     # skip copyright notice
+               '-i')
+
+# posix_spawn skips fork's page-table duplication (noticeable per
+# track once the interpreter heap has grown); absent on Windows
+_POSIX_SPAWN = hasattr(os, 'posix_spawn')
+
 # ------------------------------------------------------------
-# Global reference to the currently running ffplay process
+# Global reference to the currently running ffplay process: a Popen
+# object on the fallback path, or a bare pid when posix_spawn is used
 ffplay_process = None
+ffplay_pid = None
+
+# Absolute ffplay path, resolved once by check_ffplay
+_FFPLAY_PATH = None
+
+# Long-lived mpv process and its connected JSON IPC socket (None when
+# mpv is unavailable and per-track ffplay is used instead)
+mpv_process = None
+mpv_socket = None
+
+# Per-device (st_dev) cache of the first strategy that worked in
+# copy_to_temp_hashed ('link', 'symlink' or 'copy') so repeated songs
+# skip known-failing attempts. Only a hint: every file still falls
+# through to the remaining strategies when the cached one fails, and a
+# single file's failure never downgrades the cached value (mixed-fs
+# libraries would otherwise end up full-copying everything).
+_LINK_STRATEGY = {}
+
+# Memoized original_path -> hashed temp filename, so a song that needs
+# the temp-name workaround is only hashed once across shuffle passes.
+_DEST_NAME_CACHE = {}
+
+def _emit(text):
+    """
+    Write a message in a single write() and flush explicitly; stdout is
+    switched to block buffering at startup so multi-line messages do
+    not pay one PTY syscall per line (which can stall when the terminal
+    app is backgrounded on Termux).
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()
 
 def check_ffplay():
     """Verify ffplay is available; if not, suggest installation and exit."""
-    if shutil.which('ffplay') is not None:
+    global _FFPLAY_PATH
+    _FFPLAY_PATH = shutil.which('ffplay')
+    if _FFPLAY_PATH is not None:
         return
 
     print("Error: ffplay executable not found in PATH.", file=sys.stderr)
@@ -79,7 +148,17 @@ def check_ffplay():
 
 def cleanup_ffplay():
     """Terminate the currently running ffplay process, if any."""
-    global ffplay_process
+    global ffplay_process, ffplay_pid
+    if ffplay_pid is not None:
+        try:
+            os.killpg(ffplay_pid, signal.SIGTERM)
+        except OSError:
+            pass
+        try:
+            os.waitpid(ffplay_pid, 0)
+        except (ChildProcessError, OSError):
+            pass
+        ffplay_pid = None
     if ffplay_process and ffplay_process.poll() is None:
         ffplay_process.terminate()
         try:
@@ -88,30 +167,284 @@ def cleanup_ffplay():
             ffplay_process.kill()
         ffplay_process = None
 
-def copy_to_temp_md5(original_path):
+def _sigint_handler(signum, frame):
+    """
+    Ctrl+C fast path: kill the player's process group and leave via
+    os._exit, skipping atexit handlers and frame unwinding. The normal
+    route can block for seconds (Popen.wait with its 2 s timeout, GC of
+    the Popen object waiting again); this makes interrupt instantaneous.
+    """
+    if ffplay_pid is not None:
+        try:
+            os.killpg(ffplay_pid, signal.SIGTERM)
+        except (OSError, AttributeError):
+            pass
+    for proc in (ffplay_process, mpv_process):
+        if proc is not None and proc.poll() is None:
+            try:
+                # Players are started in their own session, so this
+                # takes out any children too. os.killpg does not exist
+                # on Windows; fall back to terminating the process.
+                os.killpg(proc.pid, signal.SIGTERM)
+            except (OSError, AttributeError):
+                try:
+                    proc.terminate()
+                except OSError:
+                    pass
+    try:
+        sys.stdout.write("\nKeyboardInterrupt received. Stopping playback...\n")
+        sys.stdout.flush()
+    except OSError:
+        pass
+    os._exit(0)
+
+def cleanup_mpv():
+    """Disconnect from and terminate the persistent mpv process, if any."""
+    global mpv_process, mpv_socket
+    if mpv_socket is not None:
+        try:
+            mpv_socket.close()
+        except OSError:
+            pass
+        mpv_socket = None
+    if mpv_process and mpv_process.poll() is None:
+        mpv_process.terminate()
+        try:
+            mpv_process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            mpv_process.kill()
+    mpv_process = None
+
+def start_mpv():
+    """
+    Start a single long-lived mpv process with a JSON IPC socket and
+    connect to it. One fork per session instead of one per song keeps
+    codec libraries warm and removes the ~100–300 ms ffplay startup
+    from every track. Returns True on success, False when mpv is not
+    installed or the socket never comes up.
+    """
+    global mpv_process, mpv_socket
+    mpv_path = shutil.which('mpv')
+    if mpv_path is None:
+        return False
+
+    sock_path = os.path.join(tempfile.gettempdir(),
+                             f'mpv-shuffle-{os.getpid()}.sock')
+    try:
+        os.unlink(sock_path)
+    except FileNotFoundError:
+        pass
+
+    try:
+        mpv_process = subprocess.Popen(
+            [mpv_path, '--no-video', '--idle=yes', '--really-quiet',
+             f'--input-ipc-server={sock_path}'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError:
+        mpv_process = None
+        return False
+
+    # The IPC socket appears shortly after mpv starts
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if mpv_process.poll() is not None:
+            break
+        if os.path.exists(sock_path):
+            try:
+                mpv_socket = socket.socket(socket.AF_UNIX)
+                mpv_socket.connect(sock_path)
+                return True
+            except OSError:
+                mpv_socket = None
+        time.sleep(0.05)
+
+    cleanup_mpv()
+    return False
+
+def play_file_mpv(filepath):
+    """
+    Play a single audio file on the persistent mpv instance and block
+    until its end-file event arrives over the IPC socket.
+    Returns True if playback reached end-of-file normally.
+    """
+    global mpv_socket
+    try:
+        _advise_playback_start(filepath)
+        command = json.dumps({'command': ['loadfile', filepath, 'replace']})
+        mpv_socket.sendall(command.encode('utf-8') + b'\n')
+
+        buf = b''
+        while True:
+            chunk = mpv_socket.recv(4096)
+            if not chunk:
+                # mpv went away; drop back to per-track ffplay
+                cleanup_mpv()
+                return False
+            buf += chunk
+            while b'\n' in buf:
+                line, buf = buf.split(b'\n', 1)
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if msg.get('event') == 'end-file':
+                    return msg.get('reason', 'eof') == 'eof'
+    except Exception as e:
+        print(f"Error playing {os.path.basename(filepath)}: {e}", file=sys.stderr)
+        cleanup_mpv()
+        return False
+    finally:
+        _advise_playback_done(filepath)
+
+def _copy_file(src_path, dst_path):
+    """
+    Copy src_path to dst_path without bouncing data through a Python
+    buffer: os.copy_file_range (Linux >= 5.3) keeps the copy entirely
+    inside the kernel, os.sendfile covers older kernels/Android, and
+    shutil.copyfileobj remains as the final fallback.
+    """
+    src_fd = os.open(src_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            size = os.fstat(src_fd).st_size
+
+            # Kernel-side copy: data never enters userspace
+            try:
+                remaining = size
+                while remaining > 0:
+                    n = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                if remaining == 0:
+                    return
+            except (AttributeError, OSError):
+                pass
+
+            # sendfile: still a single syscall per chunk, no user buffer
+            try:
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                offset = 0
+                while offset < size:
+                    n = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if n == 0:
+                        break
+                    offset += n
+                if offset == size:
+                    return
+            except (AttributeError, OSError):
+                pass
+
+            # mmap the source and write it out in one pass: no 64 KiB
+            # chunk loop, and on tmpfs the kernel can map pages
+            # directly. Skipped for tiny files (setup cost dominates)
+            # and for very large ones (address-space pressure on
+            # 32-bit Termux builds).
+            if 65536 <= size <= 1 << 30:
+                try:
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    m = mmap.mmap(src_fd, size, access=mmap.ACCESS_READ)
+                    try:
+                        with memoryview(m) as mv:
+                            written = 0
+                            while written < size:
+                                written += os.write(dst_fd, mv[written:])
+                    finally:
+                        m.close()
+                    return
+                except (ValueError, OSError):
+                    pass
+
+            # Plain buffered copy as last resort
+            os.ftruncate(dst_fd, 0)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            with open(src_fd, 'rb', closefd=False) as src, \
+                 open(dst_fd, 'wb', closefd=False) as dst:
+                shutil.copyfileobj(src, dst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def copy_to_temp_hashed(original_path):
     """
-    Copy the original music file to a temporary file whose name is
-    the MD5 hash of the original filename (without extension) plus
+    Make the original music file available under a temporary name that
+    is a short BLAKE2b hash of the original filename (without extension) plus
     the same extension.
-    Returns the full path to the temporary copy, or None on error.
+    Prefers a hardlink (same filesystem), then a symlink, and only
+    falls back to a full copy when both fail (e.g. EPERM on Android
+    shared storage) – links move zero bytes through userspace.
+    Returns the full path to the temporary file, or None on error.
     """
     basename = os.path.basename(original_path)
-    name_without_ext, ext = os.path.splitext(basename)
-    hash_md5 = hashlib.md5(name_without_ext.encode('utf-8')).hexdigest()
-    desired_name = hash_md5 + ext
+    desired_name = _DEST_NAME_CACHE.get(original_path)
+    if desired_name is None:
+        name_without_ext, ext = os.path.splitext(basename)
+        digest = hashlib.blake2b(name_without_ext.encode('utf-8'),
+                                 digest_size=8).hexdigest()
+        desired_name = digest + ext
+        _DEST_NAME_CACHE[original_path] = desired_name
+    else:
+        ext = os.path.splitext(desired_name)[1]
 
     temp_dir = tempfile.gettempdir()
     dest_path = os.path.join(temp_dir, desired_name)
 
+    # Remove any stale file/link from a previous run
     try:
-        with tempfile.NamedTemporaryFile(dir=temp_dir, suffix=ext, delete=False) as tmp_file:
-            with open(original_path, 'rb') as src:
-                shutil.copyfileobj(src, tmp_file)
-            tmp_path = tmp_file.name
+        os.unlink(dest_path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        pass
+
+    try:
+        src_dev = os.stat(original_path).st_dev
+    except OSError as e:
+        # Source gone or unreadable: every strategy below would only
+        # produce a dangling link, so report the copy error up front
+        print(f"Error creating temporary copy for {basename}: {e}", file=sys.stderr)
+        return None
+    cached = _LINK_STRATEGY.get(src_dev)
+
+    # Hardlink: same inode, no data copied (fails across filesystems).
+    # Resolve symlinked sources first – os.link on a symlink links the
+    # symlink itself, which dangles when its target is relative.
+    if cached in (None, 'link'):
+        try:
+            os.link(os.path.realpath(original_path), dest_path)
+            if cached is None:
+                _LINK_STRATEGY[src_dev] = 'link'
+            return dest_path
+        except OSError:
+            pass
+
+    # Symlink: works across filesystems, still no data copied
+    if cached in (None, 'link', 'symlink'):
+        try:
+            os.symlink(os.path.abspath(original_path), dest_path)
+            if cached is None:
+                _LINK_STRATEGY[src_dev] = 'symlink'
+            return dest_path
+        except OSError:
+            pass
+
+    # Last resort: full copy (kernel-side where the OS supports it)
+    try:
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=temp_dir, suffix=ext)
+        os.close(tmp_fd)
+        _copy_file(original_path, tmp_path)
 
-        if os.path.exists(dest_path):
-            os.remove(dest_path)
         os.rename(tmp_path, dest_path)
+        if cached is None:
+            _LINK_STRATEGY[src_dev] = 'copy'
         return dest_path
     except Exception as e:
         print(f"Error creating temporary copy for {basename}: {e}", file=sys.stderr)
@@ -119,57 +452,202 @@ def copy_to_temp_md5(original_path):
             os.remove(tmp_path)
         return None
 
+def _fadvise(path, *advices):
+    """Apply posix_fadvise hints to a whole file, where supported."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            for advice in advices:
+                os.posix_fadvise(fd, 0, 0, advice)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def _prefetch(path):
+    """Ask the kernel to pull the file into the page cache ahead of use."""
+    if hasattr(os, 'posix_fadvise'):
+        _fadvise(path, os.POSIX_FADV_WILLNEED)
+
+def _advise_playback_start(path):
+    """
+    Prime the kernel before the player opens the file: SEQUENTIAL makes
+    readahead ramp up immediately instead of through its slow-start
+    heuristic (smaller track-start gap, fewer underruns on slow
+    storage) and WILLNEED starts pulling pages right away.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        _fadvise(path, os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED)
+
+def _advise_playback_done(path):
+    """Drop the finished track's pages; shuffle won't replay it soon."""
+    if hasattr(os, 'posix_fadvise'):
+        _fadvise(path, os.POSIX_FADV_DONTNEED)
+
 def play_file(filepath):
     """
     Play a single audio file using ffplay in headless mode.
     Blocks until playback finishes or is interrupted.
     Returns True if ffplay exited normally (return code 0), False otherwise.
     """
-    global ffplay_process
+    global ffplay_process, ffplay_pid
     try:
-        cmd = [
-            'ffplay',
-            '-nodisp',          # no video output
-            '-autoexit',        # exit when playback ends
-            '-loglevel', 'quiet',   # suppress log messages
-            '-hide_banner',     # skip copyright notice
-            '-i', filepath
-        ]
-        ffplay_process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-        returncode = ffplay_process.wait()
+        _advise_playback_start(filepath)
+        if _POSIX_SPAWN and _FFPLAY_PATH is not None:
+            # vfork-style spawn: no page-table copy of the interpreter.
+            # The file actions replace stdout/stderr with /dev/null,
+            # matching the Popen DEVNULL redirects.
+            ffplay_pid = os.posix_spawn(
+                _FFPLAY_PATH,
+                _FFPLAY_CMD + (filepath,),
+                os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0o644),
+                    (os.POSIX_SPAWN_DUP2, 1, 2),
+                ],
+                setsid=True
+            )
+            _, status = os.waitpid(ffplay_pid, 0)
+            ffplay_pid = None
+            returncode = os.waitstatus_to_exitcode(status)
+        else:
+            ffplay_process = subprocess.Popen(
+                _FFPLAY_CMD + (filepath,),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            returncode = ffplay_process.wait()
         if returncode != 0:
             print(f"ffplay exited with code {returncode} for {os.path.basename(filepath)}", file=sys.stderr)
             return False
         return True
-    except KeyboardInterrupt:
-        # User pressed Ctrl+C: kill ffplay and re-raise
-        cleanup_ffplay()
-        raise
     except Exception as e:
         print(f"Error playing {os.path.basename(filepath)}: {e}", file=sys.stderr)
         return False
     finally:
         ffplay_process = None
+        ffplay_pid = None
+        _advise_playback_done(filepath)
+
+def _scan_dir(path, dirs_out, files_out):
+    """
+    Scan a single directory with os.scandir, appending subdirectories
+    to dirs_out and matching music files to files_out. DirEntry answers
+    is_dir/is_file from the directory read itself (no stat per regular
+    file on Linux) and entry.path saves an os.path.join per file.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs_out.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            name = entry.name
+            match = _EXT_SEARCH(name)
+            if match is not None and match.start() > 0:
+                # Identity key for dedup; follows symlinks so a link
+                # and its target collapse to one entry
+                try:
+                    st = entry.stat()
+                    key = (st.st_dev, st.st_ino)
+                except OSError:
+                    key = None
+                files_out.append((entry.path, key))
 
 def gather_music_files(folder):
-    """Recursively collect all supported music files from the given folder."""
+    """
+    Recursively collect all supported music files from the given folder.
+    Directories are scanned by a small pool of threads: on slow storage
+    (FUSE-backed /storage/emulated/0, SD cards) each directory read is
+    a high-latency syscall, and a few workers overlap those waits
+    instead of serializing them.
+    """
     files = []
-    for root, _, filenames in os.walk(folder):
-        for name in filenames:
-            ext = os.path.splitext(name)[1].lower()
-            if ext in MUSIC_EXTS:
-                files.append(os.path.join(root, name))
-    return files
+    tasks = queue.Queue()
+    tasks.put(folder)
+    merge_lock = threading.Lock()
+
+    def worker():
+        local_files = []
+        while True:
+            directory = tasks.get()
+            if directory is None:
+                tasks.task_done()
+                break
+            subdirs = []
+            _scan_dir(directory, subdirs, local_files)
+            # Enqueue subdirs before task_done so the join below cannot
+            # release while work is still being discovered
+            for sub in subdirs:
+                tasks.put(sub)
+            tasks.task_done()
+        with merge_lock:
+            files.extend(local_files)
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(_WALK_THREADS)]
+    for t in threads:
+        t.start()
+    tasks.join()
+    for _ in threads:
+        tasks.put(None)
+    for t in threads:
+        t.join()
+
+    # Drop hardlink/symlink duplicates (common on Termux setups that
+    # mirror /storage/emulated/0/Music into ~/Music) so each track is
+    # listed, hashed and played once
+    seen = set()
+    unique = []
+    for path, key in files:
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        unique.append(path)
+    return unique
+
+def shuffle_songs(songs):
+    """
+    Shuffle the playlist in place. For large libraries, use NumPy's
+    C-level permutation (PCG64) when available; below ~1k entries the
+    import and gather cost outweighs random.shuffle's per-element
+    Python overhead.
+    """
+    if len(songs) >= 1000:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            order = numpy.random.default_rng().permutation(len(songs))
+            songs[:] = [songs[i] for i in order]
+            return
+    random.shuffle(songs)
 
 def main():
     if len(sys.argv) != 2:
         print(f"Usage: {sys.argv[0]} <folder_path>")
         sys.exit(1)
 
+    # Block-buffer stdout; _emit flushes explicitly, so each message is
+    # one write() regardless of how many lines it spans
+    try:
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    except (AttributeError, OSError):
+        pass
+
     folder = sys.argv[1]
     if not os.path.isdir(folder):
         print(f"Error: '{folder}' is not a valid directory.", file=sys.stderr)
@@ -178,8 +656,20 @@ def main():
     # Ensure ffplay is available before proceeding
     check_ffplay()
 
-    # Register cleanup to kill ffplay on normal exit
+    # Register cleanup to kill the player on normal exit
     atexit.register(cleanup_ffplay)
+    atexit.register(cleanup_mpv)
+
+    # Ctrl+C goes through a C-level signal handler that kills the
+    # player's process group and _exits immediately, instead of
+    # unwinding Python frames with KeyboardInterrupt
+    signal.signal(signal.SIGINT, _sigint_handler)
+
+    # One long-lived mpv beats a fork+exec per track; ffplay remains
+    # the fallback when mpv is not installed
+    player = 'mpv' if start_mpv() else 'ffplay'
+    if player == 'mpv':
+        _emit("Using persistent mpv for playback.\n")
 
     # Gather music files
     songs = gather_music_files(folder)
@@ -187,37 +677,62 @@ def main():
         print(f"No supported music files found in '{folder}'.", file=sys.stderr)
         sys.exit(1)
 
-    print(f"Found {len(songs)} music file(s). Starting shuffled playback with ffplay...")
-    print("Press Ctrl+C to stop.\n")
+    _emit(f"Found {len(songs)} music file(s). "
+          f"Starting shuffled playback with {player}...\n"
+          "Press Ctrl+C to stop.\n\n")
 
-    try:
-        while True:
-            random.shuffle(songs)
-            for song in songs:
-                print(f"Now playing: {os.path.basename(song)}")
-
-                # Create temporary MD5‑named copy
-                temp_path = copy_to_temp_md5(song)
-                if temp_path is None:
-                    print("Skipping due to copy error.\n")
-                    continue
+    # Shuffle a compact index array and rotate through it: O(1) work
+    # per track, with the songs list itself left untouched. A full
+    # re-permute only happens when a pass completes.
+    order = list(range(len(songs)))
+    shuffle_songs(order)
+    pos = 0
+    while True:
+        song = songs[order[pos]]
+        pos += 1
+        if pos == len(order):
+            shuffle_songs(order)
+            pos = 0
+        next_song = songs[order[pos]]
+
+        _emit(f"Now playing: {os.path.basename(song)}\n")
+
+        # Warm the page cache for the next track while this one
+        # plays; fire-and-forget, nothing to join
+        if next_song != song:
+            threading.Thread(target=_prefetch,
+                             args=(next_song,),
+                             daemon=True).start()
 
+        # ffplay takes arbitrary paths (Unicode, spaces) via
+        # argv without shell interpretation, so play the
+        # original file directly. Only fall back to the
+        # hash-named temp file for control characters that
+        # ffplay's option parsing can mangle.
+        temp_path = None
+        if '\n' in song or '\r' in song:
+            temp_path = copy_to_temp_hashed(song)
+            if temp_path is None:
+                _emit("Skipping due to copy error.\n\n")
+                continue
+
+        try:
+            path_to_play = temp_path if temp_path else song
+            if mpv_socket is not None:
+                success = play_file_mpv(path_to_play)
+            else:
+                success = play_file(path_to_play)
+            if success:
+                _emit("Finished.\n\n")
+            else:
+                _emit("Playback failed, skipping.\n\n")
+        finally:
+            # Clean up temporary file, if one was needed
+            if temp_path is not None:
                 try:
-                    success = play_file(temp_path)
-                    if success:
-                        print("Finished.\n")
-                    else:
-                        print("Playback failed, skipping.\n")
-                finally:
-                    # Clean up temporary file
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
-    except KeyboardInterrupt:
-        print("\nKeyboardInterrupt received. Stopping playback...")
-        cleanup_ffplay()
-        sys.exit(0)
+                    os.remove(temp_path)
+                except OSError:
+                    pass
 
 if __name__ == '__main__':
     main()
@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 """
 Termux Music Player – Play shuffled music from a folder.
-Creates a temporary MD5‑named copy of each file before playing.
+Creates a temporary hash‑named copy of each file before playing.
 Stops playback automatically when the script exits.
 """
 
 import os
+import re
 import sys
 import random
 import time
@@ -14,20 +15,72 @@ import hashlib
 import tempfile
 import subprocess
 import shutil
+import mmap
+import threading
+import queue
 
 # ------------------------------------------------------------
 # Supported audio file extensions (add more if needed)
 MUSIC_EXTS = {'.mp3', '.flac', '.wav', '.m4a', '.ogg', '.aac',
               '.opus', '.wma', '.ape', '.aiff', '.dsf'}
 
+# Worker threads for the library walk; enough to overlap slow-storage
+# directory reads without thrashing
+_WALK_THREADS = 4
+
+# ffprobe lets us sleep through most of a track instead of polling;
+# resolved once at import, optional
+_FFPROBE = shutil.which('ffprobe')
+
+# Constant argv tuples, built once instead of a fresh list per call
+_MEDIA_STOP_CMD = ('termux-media-player', 'stop')
+_MEDIA_INFO_CMD = ('termux-media-player', 'info')
+_MEDIA_PLAY_CMD = ('termux-media-player', 'play')
+_FFPROBE_CMD = ((_FFPROBE, '-v', 'error',
+                 '-show_entries', 'format=duration',
+                 '-of', 'default=noprint_wrappers=1:nokey=1')
+                if _FFPROBE else None)
+
+# Extension filter for the walk hot path, compiled once into re's
+# C-level matching engine: a single bound-method call per name replaces
+# the split/lowercase/set-probe chain
+_EXT_SEARCH = re.compile(
+    '(?:' + '|'.join(re.escape(e) for e in sorted(MUSIC_EXTS)) + r')\Z',
+    re.IGNORECASE
+).search
+
+# Filenames hashed per blake2b call when batching temp names: the
+# largest blake2b digest is 64 bytes and each file takes 8
+_HASH_BATCH = 8
+
+# ------------------------------------------------------------
+# Per-device (st_dev) cache of the first strategy that worked in
+# copy_to_temp_hashed ('link', 'symlink' or 'copy') so repeated songs
+# skip known-failing attempts. Only a hint: every file still falls
+# through to the remaining strategies when the cached one fails, and a
+# single file's failure never downgrades the cached value (mixed-fs
+# libraries would otherwise end up full-copying everything).
+_LINK_STRATEGY = {}
+
+# ------------------------------------------------------------
+def _emit(text):
+    """
+    Write a message in a single write() and flush explicitly; stdout is
+    switched to block buffering at startup so multi-line messages do
+    not pay one PTY syscall per line (which can stall when the terminal
+    app is backgrounded on Termux).
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
 # ------------------------------------------------------------
 def stop_music():
     """Stop any currently playing media."""
     try:
-        subprocess.run(['termux-media-player', 'stop'],
+        subprocess.run(_MEDIA_STOP_CMD,
                        check=False, capture_output=True)
     except Exception as e:
-        print(f"Error while stopping music: {e}")
+        _emit(f"Error while stopping music: {e}\n")
 
 # ------------------------------------------------------------
 def is_playing():
@@ -37,7 +90,7 @@ def is_playing():
     """
     try:
         output = subprocess.check_output(
-            ['termux-media-player', 'info'],
+            _MEDIA_INFO_CMD,
             text=True, stderr=subprocess.STDOUT
         )
         # "No track currently!" indicates playback has finished
@@ -50,65 +103,350 @@ def is_playing():
         sys.exit(1)
 
 # ------------------------------------------------------------
-def copy_to_temp_md5(original_path):
+def _copy_file(src_path, dst_path):
     """
-    Copy the original music file to a temporary file whose name is
-    the MD5 hash of the original filename (without extension) plus
-    the same extension. Uses tempfile.NamedTemporaryFile and then
-    renames the file to the desired name.
-    Returns the full path to the temporary copy.
+    Copy src_path to dst_path without bouncing data through a Python
+    buffer: os.copy_file_range (Linux >= 5.3) keeps the copy entirely
+    inside the kernel, os.sendfile covers older kernels/Android, and
+    shutil.copyfileobj remains as the final fallback.
+    """
+    src_fd = os.open(src_path, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            size = os.fstat(src_fd).st_size
+
+            # Kernel-side copy: data never enters userspace
+            try:
+                remaining = size
+                while remaining > 0:
+                    n = os.copy_file_range(src_fd, dst_fd, remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                if remaining == 0:
+                    return
+            except (AttributeError, OSError):
+                pass
+
+            # sendfile: still a single syscall per chunk, no user buffer
+            try:
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                offset = 0
+                while offset < size:
+                    n = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if n == 0:
+                        break
+                    offset += n
+                if offset == size:
+                    return
+            except (AttributeError, OSError):
+                pass
+
+            # mmap the source and write it out in one pass: no 64 KiB
+            # chunk loop, and on tmpfs the kernel can map pages
+            # directly. Skipped for tiny files (setup cost dominates)
+            # and for very large ones (address-space pressure on
+            # 32-bit Termux builds).
+            if 65536 <= size <= 1 << 30:
+                try:
+                    os.ftruncate(dst_fd, 0)
+                    os.lseek(dst_fd, 0, os.SEEK_SET)
+                    m = mmap.mmap(src_fd, size, access=mmap.ACCESS_READ)
+                    try:
+                        with memoryview(m) as mv:
+                            written = 0
+                            while written < size:
+                                written += os.write(dst_fd, mv[written:])
+                    finally:
+                        m.close()
+                    return
+                except (ValueError, OSError):
+                    pass
+
+            # Plain buffered copy as last resort
+            os.ftruncate(dst_fd, 0)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            with open(src_fd, 'rb', closefd=False) as src, \
+                 open(dst_fd, 'wb', closefd=False) as dst:
+                shutil.copyfileobj(src, dst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+# ------------------------------------------------------------
+def copy_to_temp_hashed(original_path, desired_name=None):
+    """
+    Make the original music file available under a temporary name that
+    is a short BLAKE2b hash of the original filename (without extension) plus
+    the same extension. The name is normally precomputed once by
+    gather_music_files and passed in via desired_name.
+    Prefers a hardlink (same filesystem), then a symlink, and only
+    falls back to a full copy when both fail (e.g. EPERM on Android
+    shared storage) – links move zero bytes through userspace.
+    Returns the full path to the temporary file, or None on error.
     """
-    # Compute desired filename: hash + extension
     basename = os.path.basename(original_path)
-    name_without_ext, ext = os.path.splitext(basename)
-    hash_md5 = hashlib.md5(name_without_ext.encode('utf-8')).hexdigest()
-    desired_name = hash_md5 + ext
+    if desired_name is None:
+        # Compute desired filename: hash + extension
+        name_without_ext, ext = os.path.splitext(basename)
+        digest = hashlib.blake2b(name_without_ext.encode('utf-8'),
+                                 digest_size=8).hexdigest()
+        desired_name = digest + ext
+    else:
+        ext = os.path.splitext(desired_name)[1]
 
     temp_dir = tempfile.gettempdir()
     dest_path = os.path.join(temp_dir, desired_name)
 
-    # Use NamedTemporaryFile to create a secure temporary file
+    # Remove any stale file/link from a previous run
+    try:
+        os.unlink(dest_path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        pass
+
+    try:
+        src_dev = os.stat(original_path).st_dev
+    except OSError as e:
+        # Source gone or unreadable: every strategy below would only
+        # produce a dangling link, so report the copy error up front
+        _emit(f"Error creating temporary copy for {basename}: {e}\n")
+        return None
+    cached = _LINK_STRATEGY.get(src_dev)
+
+    # Hardlink: same inode, no data copied (fails across filesystems).
+    # Resolve symlinked sources first – os.link on a symlink links the
+    # symlink itself, which dangles when its target is relative.
+    if cached in (None, 'link'):
+        try:
+            os.link(os.path.realpath(original_path), dest_path)
+            if cached is None:
+                _LINK_STRATEGY[src_dev] = 'link'
+            return dest_path
+        except OSError:
+            pass
+
+    # Symlink: works across filesystems, still no data copied
+    if cached in (None, 'link', 'symlink'):
+        try:
+            os.symlink(os.path.abspath(original_path), dest_path)
+            if cached is None:
+                _LINK_STRATEGY[src_dev] = 'symlink'
+            return dest_path
+        except OSError:
+            pass
+
+    # Last resort: full copy (kernel-side where the OS supports it)
     try:
-        with tempfile.NamedTemporaryFile(dir=temp_dir,
-                                         suffix=ext,
-                                         delete=False) as tmp_file:
-            # Copy content from original to temporary file
-            with open(original_path, 'rb') as src:
-                shutil.copyfileobj(src, tmp_file)
-            tmp_path = tmp_file.name
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=temp_dir, suffix=ext)
+        os.close(tmp_fd)
+        _copy_file(original_path, tmp_path)
         # Now rename the temporary file to the desired hash name
-        if os.path.exists(dest_path):
-            os.remove(dest_path)      # overwrite if exists
         os.rename(tmp_path, dest_path)
+        if cached is None:
+            _LINK_STRATEGY[src_dev] = 'copy'
         return dest_path
     except Exception as e:
-        print(f"Error creating temporary copy for {basename}: {e}")
+        _emit(f"Error creating temporary copy for {basename}: {e}\n")
         # Clean up temporary file if it still exists
-        if os.path.exists(tmp_path):
+        if 'tmp_path' in locals() and os.path.exists(tmp_path):
             os.remove(tmp_path)
         return None
 
+# ------------------------------------------------------------
+def get_duration(path):
+    """
+    Return the track duration in seconds via ffprobe, or None when
+    ffprobe is unavailable or cannot parse the file.
+    """
+    if _FFPROBE_CMD is None:
+        return None
+    try:
+        output = subprocess.check_output(
+            _FFPROBE_CMD + (path,),
+            text=True, stderr=subprocess.DEVNULL
+        )
+        return float(output.strip())
+    except (subprocess.CalledProcessError, ValueError, OSError):
+        return None
+
+# ------------------------------------------------------------
+def wait_for_track_end(duration=None):
+    """
+    Block until termux-media-player reports no current track, spawning
+    as few `info` subprocesses as possible. Every poll forks the
+    Termux:API bridge, so sleep through the bulk of the track when the
+    duration is known and only poll once per second near the end; with
+    an unknown duration, back off exponentially (capped so the gap
+    between tracks stays small).
+    """
+    if duration is not None and duration > 3:
+        time.sleep(duration - 2)
+        while is_playing():
+            time.sleep(1)
+        return
+
+    delay = 1
+    while is_playing():
+        time.sleep(delay)
+        delay = min(delay * 2, 8)
+
+# ------------------------------------------------------------
+def _prefetch(path):
+    """Ask the kernel to pull the file into the page cache ahead of use."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
 # ------------------------------------------------------------
 def play_file(filepath):
     """Play a single media file."""
     try:
-        subprocess.run(['termux-media-player', 'play', filepath],
+        subprocess.run(_MEDIA_PLAY_CMD + (filepath,),
                        check=True, capture_output=True)
         return True
     except subprocess.CalledProcessError:
-        print(f"Failed to play: {os.path.basename(filepath)}")
+        _emit(f"Failed to play: {os.path.basename(filepath)}\n")
         return False
 
+# ------------------------------------------------------------
+def _scan_dir(path, dirs_out, files_out):
+    """
+    Scan a single directory with os.scandir, appending subdirectories
+    to dirs_out and (path, stem_bytes, ext) tuples for matching music
+    files to files_out. DirEntry answers is_dir/is_file from the
+    directory read itself, so no stat per regular file.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs_out.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            name = entry.name
+            match = _EXT_SEARCH(name)
+            if match is not None and match.start() > 0:
+                # Identity key for dedup; follows symlinks so a link
+                # and its target collapse to one entry
+                try:
+                    st = entry.stat()
+                    key = (st.st_dev, st.st_ino)
+                except OSError:
+                    key = None
+                # Hashing of the stem bytes is batched later in
+                # gather_music_files
+                dot = match.start()
+                files_out.append((entry.path, key,
+                                  name[:dot].encode('utf-8',
+                                                    'surrogateescape'),
+                                  name[dot:]))
+
 # ------------------------------------------------------------
 def gather_music_files(folder):
-    """Recursively collect all music files from the given folder."""
+    """
+    Recursively collect all music files from the given folder.
+    Returns a list of (path, desired_name) tuples where desired_name is
+    the precomputed hashed temp filename, so each file is hashed once at
+    startup instead of on every shuffle pass.
+    Directories are scanned by a small pool of threads: on FUSE-backed
+    /storage/emulated/0 each directory read is a high-latency syscall,
+    and a few workers overlap those waits instead of serializing them.
+    """
     files = []
-    for root, _, filenames in os.walk(folder):
-        for name in filenames:
-            ext = os.path.splitext(name)[1].lower()
-            if ext in MUSIC_EXTS:
-                files.append(os.path.join(root, name))
-    return files
+    tasks = queue.Queue()
+    tasks.put(folder)
+    merge_lock = threading.Lock()
+
+    def worker():
+        local_files = []
+        while True:
+            directory = tasks.get()
+            if directory is None:
+                tasks.task_done()
+                break
+            subdirs = []
+            _scan_dir(directory, subdirs, local_files)
+            # Enqueue subdirs before task_done so the join below cannot
+            # release while work is still being discovered
+            for sub in subdirs:
+                tasks.put(sub)
+            tasks.task_done()
+        with merge_lock:
+            files.extend(local_files)
+
+    threads = [threading.Thread(target=worker, daemon=True)
+               for _ in range(_WALK_THREADS)]
+    for t in threads:
+        t.start()
+    tasks.join()
+    for _ in threads:
+        tasks.put(None)
+    for t in threads:
+        t.join()
+
+    # Drop hardlink/symlink duplicates (common on Termux setups that
+    # mirror /storage/emulated/0/Music into ~/Music) so each track is
+    # listed, hashed and played once
+    seen = set()
+    records = []
+    for path, key, stem, ext in files:
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        records.append((path, stem, ext))
+
+    # Batch the filename hashing: one blake2b call per _HASH_BATCH
+    # stems, sliced into 8-byte per-file digests, instead of paying a
+    # hash-context setup per file. Names only need to be unique within
+    # this run, so batch composition does not matter.
+    songs = []
+    for i in range(0, len(records), _HASH_BATCH):
+        batch = records[i:i + _HASH_BATCH]
+        digests = hashlib.blake2b(b'\0'.join(stem for _, stem, _ in batch),
+                                  digest_size=8 * len(batch)).digest()
+        for j, (path, _stem, ext) in enumerate(batch):
+            songs.append((path, digests[j * 8:(j + 1) * 8].hex() + ext))
+    return songs
+
+# ------------------------------------------------------------
+def shuffle_songs(songs):
+    """
+    Shuffle the playlist in place. For large libraries, use NumPy's
+    C-level permutation (PCG64) when available; below ~1k entries the
+    import and gather cost outweighs random.shuffle's per-element
+    Python overhead.
+    """
+    if len(songs) >= 1000:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            order = numpy.random.default_rng().permutation(len(songs))
+            songs[:] = [songs[i] for i in order]
+            return
+    random.shuffle(songs)
 
 # ------------------------------------------------------------
 def main():
@@ -116,6 +454,13 @@ def main():
         print(f"Usage: {sys.argv[0]} <folder_path>")
         sys.exit(1)
 
+    # Block-buffer stdout; _emit flushes explicitly, so each message is
+    # one write() regardless of how many lines it spans
+    try:
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    except (AttributeError, OSError):
+        pass
+
     folder = sys.argv[1]
     if not os.path.isdir(folder):
         print(f"Error: '{folder}' is not a valid directory.")
@@ -130,40 +475,93 @@ def main():
         print(f"No supported music files found in '{folder}'.")
         sys.exit(1)
 
-    print(f"Found {len(songs)} music file(s). Starting shuffled playback...")
-    print("Press Ctrl+C to stop.\n")
+    _emit(f"Found {len(songs)} music file(s). "
+          "Starting shuffled playback...\n"
+          "Press Ctrl+C to stop.\n\n")
 
+    # Shuffle a compact index array and rotate through it: O(1) work
+    # per track, with the songs list itself left untouched. A full
+    # re-permute only happens when a pass completes.
+    order = list(range(len(songs)))
+    shuffle_songs(order)
+    pos = 0
+    prepared_path = None  # copy made while the previous song played
+    prep = None           # in-flight preparation of that copy
     try:
         while True:
-            random.shuffle(songs)
-            for song in songs:
-                print(f"Now playing: {os.path.basename(song)}")
-
-                # Create temporary MD5‑named copy
-                temp_path = copy_to_temp_md5(song)
-                if temp_path is None:
-                    print("Skipping due to copy error.")
+            song, desired_name = songs[order[pos]]
+            pos += 1
+            if pos == len(order):
+                shuffle_songs(order)
+                pos = 0
+            next_song, next_name = songs[order[pos]]
+
+            _emit(f"Now playing: {os.path.basename(song)}\n")
+
+            # Collect the copy prepared during the previous track. The
+            # join is outside the playback try/finally so Ctrl+C is not
+            # held hostage by a background copy still in flight.
+            if prep is not None:
+                prep['thread'].join()
+                prepared_path = prep.get('temp_path')
+                prep = None
+
+            # Use the copy prepared during the previous track, or
+            # make one now (first track, or preparation failed)
+            if prepared_path is not None:
+                temp_path = prepared_path
+                prepared_path = None
+            else:
+                temp_path = copy_to_temp_hashed(song, desired_name)
+            if temp_path is None:
+                _emit("Skipping due to copy error.\n")
+                continue
+
+            try:
+                # Play the temporary copy
+                if not play_file(temp_path):
+                    # Skip if playback fails (removal in finally)
                     continue
+
+                # Prepare the next track in the background so the
+                # copy cost hides behind audio playback. Skip when
+                # the temp names collide – preparing would clobber
+                # the file currently playing.
+                if next_name != desired_name:
+                    prep = {}
+
+                    def _prepare(res=prep, path=next_song,
+                                 name=next_name):
+                        _prefetch(path)
+                        res['temp_path'] = copy_to_temp_hashed(path, name)
+
+                    prep['thread'] = threading.Thread(
+                        target=_prepare, daemon=True)
+                    prep['thread'].start()
+
+                # Wait until the track finishes, polling as little
+                # as possible
+                wait_for_track_end(get_duration(song))
+
+                _emit("Finished.\n\n")
+            finally:
+                # Remove the temporary file
                 try:
-                    # Play the temporary copy
-                    if not play_file(temp_path):
-                        # Clean up and skip if playback fails
-                        os.remove(temp_path)
-                        continue
-
-                    # Wait until the track finishes
-                    while is_playing():
-                        time.sleep(1)
-
-                    print("Finished.\n")
-                finally:
-                    # Remove the temporary file
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass  # might already be gone, ignore
+                    os.remove(temp_path)
+                except OSError:
+                    pass
     except KeyboardInterrupt:
-        print("\nKeyboardInterrupt received. Stopping playback...")
+        _emit("\nKeyboardInterrupt received. Stopping playback...\n")
+        # Give a background copy a moment to finish, then remove
+        # whatever it produced so no temp file outlives the player.
+        if prep is not None:
+            prep['thread'].join(timeout=1)
+            prepared_path = prep.get('temp_path') or prepared_path
+        if prepared_path is not None:
+            try:
+                os.remove(prepared_path)
+            except OSError:
+                pass
         # stop_music is already registered via atexit
         stop_music()
         sys.exit(0)